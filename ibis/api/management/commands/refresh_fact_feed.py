@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = "Refreshes the materialized fact_feed view backing FactFeed. Meant to be run periodically (e.g. from cron)"
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            # Other databases get a plain view, which never goes stale
+            self.stdout.write("fact_feed is not materialized on {}, nothing to refresh".format(connection.vendor))
+            return
+        with connection.cursor() as cursor:
+            cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY fact_feed")
+        self.stdout.write(self.style.SUCCESS("Refreshed fact_feed"))
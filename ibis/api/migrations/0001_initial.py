@@ -0,0 +1,149 @@
+# Generated by Django 2.1.15 on 2026-10-15 06:08
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Alias',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64)),
+            ],
+            options={
+                'verbose_name_plural': 'aliases',
+                'abstract': False,
+                'default_related_name': '%(class)ses',
+            },
+        ),
+        migrations.CreateModel(
+            name='Fact',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(blank=True, max_length=128)),
+                ('value', models.CharField(max_length=128)),
+            ],
+            options={
+                'abstract': False,
+                'default_related_name': '%(class)ss',
+            },
+        ),
+        migrations.CreateModel(
+            name='Period',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start', models.DateTimeField(blank=True, null=True)),
+                ('end', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='periods', related_query_name='period', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+                'default_related_name': '%(class)ss',
+            },
+        ),
+        migrations.CreateModel(
+            name='Source',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=128)),
+                ('accessed', models.DateTimeField(default=django.utils.timezone.now)),
+                ('author', models.CharField(blank=True, max_length=128)),
+                ('publisher', models.CharField(blank=True, max_length=128)),
+                ('published', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sources', related_query_name='source', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+                'default_related_name': '%(class)ss',
+            },
+        ),
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64)),
+                ('text', models.TextField(blank=True)),
+                ('tags', models.ManyToManyField(related_name='tagged_by', to='api.Tag')),
+            ],
+            options={
+                'abstract': False,
+                'default_related_name': '%(class)ss',
+            },
+        ),
+        migrations.CreateModel(
+            name='TagType',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tagtypes', related_query_name='tagtype', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+                'default_related_name': '%(class)ss',
+            },
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='type',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tags', related_query_name='tag', to='api.TagType'),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tags', related_query_name='tag', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='fact',
+            name='context',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='contextualized', to='api.Tag'),
+        ),
+        migrations.AddField(
+            model_name='fact',
+            name='period',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='facts', related_query_name='fact', to='api.Period'),
+        ),
+        migrations.AddField(
+            model_name='fact',
+            name='sources',
+            field=models.ManyToManyField(blank=True, related_name='facts', related_query_name='fact', to='api.Source'),
+        ),
+        migrations.AddField(
+            model_name='fact',
+            name='tags',
+            field=models.ManyToManyField(blank=True, related_name='facts', related_query_name='fact', to='api.Tag'),
+        ),
+        migrations.AddField(
+            model_name='fact',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='facts', related_query_name='fact', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='alias',
+            name='tag',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', related_query_name='alias', to='api.Tag'),
+        ),
+        migrations.AddField(
+            model_name='alias',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', related_query_name='alias', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterUniqueTogether(
+            name='tag',
+            unique_together={('name', 'user')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='alias',
+            unique_together={('name', 'user')},
+        ),
+    ]
@@ -0,0 +1,76 @@
+from django.db import NotSupportedError, migrations
+
+# Keeps Fact.context in Fact.tags inside the database, so the invariant also holds for bulk_create()/update()
+# Django's UPDATE sets every column on save(), so the update triggers check that the context actually changed
+CREATE_TRIGGER = {
+    'sqlite': [
+        """
+        CREATE TRIGGER api_fact_context_tag_insert AFTER INSERT ON api_fact
+        WHEN NEW.context_id IS NOT NULL
+        BEGIN
+            INSERT OR IGNORE INTO api_fact_tags (fact_id, tag_id) VALUES (NEW.id, NEW.context_id);
+        END
+        """,
+        """
+        CREATE TRIGGER api_fact_context_tag_update AFTER UPDATE OF context_id ON api_fact
+        WHEN NEW.context_id IS NOT NULL AND NEW.context_id IS NOT OLD.context_id
+        BEGIN
+            INSERT OR IGNORE INTO api_fact_tags (fact_id, tag_id) VALUES (NEW.id, NEW.context_id);
+        END
+        """,
+    ],
+    'postgresql': [
+        """
+        CREATE FUNCTION api_fact_sync_context_tag() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.context_id IS NOT NULL THEN
+                INSERT INTO api_fact_tags (fact_id, tag_id) VALUES (NEW.id, NEW.context_id) ON CONFLICT DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        """
+        CREATE TRIGGER api_fact_context_tag_insert AFTER INSERT ON api_fact
+        FOR EACH ROW EXECUTE PROCEDURE api_fact_sync_context_tag()
+        """,
+        """
+        CREATE TRIGGER api_fact_context_tag_update AFTER UPDATE OF context_id ON api_fact
+        FOR EACH ROW WHEN (OLD.context_id IS DISTINCT FROM NEW.context_id)
+        EXECUTE PROCEDURE api_fact_sync_context_tag()
+        """,
+    ],
+}
+
+DROP_TRIGGER = {
+    'sqlite': [
+        "DROP TRIGGER IF EXISTS api_fact_context_tag_insert",
+        "DROP TRIGGER IF EXISTS api_fact_context_tag_update",
+    ],
+    'postgresql': [
+        "DROP TRIGGER IF EXISTS api_fact_context_tag_insert ON api_fact",
+        "DROP TRIGGER IF EXISTS api_fact_context_tag_update ON api_fact",
+        "DROP FUNCTION IF EXISTS api_fact_sync_context_tag()",
+    ],
+}
+
+
+def _run_for_vendor(statements):
+    def run(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        if vendor not in statements:
+            raise NotSupportedError("Fact context trigger requires SQLite or PostgreSQL, not {}".format(vendor))
+        for sql in statements[vendor]:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run_for_vendor(CREATE_TRIGGER), _run_for_vendor(DROP_TRIGGER)),
+    ]
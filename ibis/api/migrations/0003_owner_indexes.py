@@ -0,0 +1,37 @@
+# Generated by Django 2.1.15 on 2026-10-15 06:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_fact_context_tag_trigger'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alias',
+            index=models.Index(fields=['user', 'name'], name='api_alias_user_id_ca7af7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fact',
+            index=models.Index(fields=['user', 'context'], name='api_fact_user_id_94edb0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='period',
+            index=models.Index(fields=['user', 'start'], name='api_period_user_id_823200_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='source',
+            index=models.Index(fields=['user', 'name'], name='api_source_user_id_6ffdc0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['user', 'name'], name='api_tag_user_id_ef3bf5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tagtype',
+            index=models.Index(fields=['user', 'name'], name='api_tagtype_user_id_2eb39a_idx'),
+        ),
+    ]
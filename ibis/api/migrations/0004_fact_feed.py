@@ -0,0 +1,78 @@
+# Generated by Django 2.1.15 on 2026-10-15 06:10
+
+from django.db import NotSupportedError, migrations, models
+
+# SQLite has no materialized views, so there the feed is a plain view that is always current
+CREATE_VIEW = {
+    'sqlite': [
+        """
+        CREATE VIEW fact_feed AS
+        SELECT f.id, f.user_id, f.key, f.value, c.name AS context_name, p.start AS period_start, p."end" AS period_end,
+            (SELECT json_group_array(t.name) FROM api_fact_tags ft INNER JOIN api_tag t ON t.id = ft.tag_id
+                WHERE ft.fact_id = f.id) AS tag_names,
+            (SELECT json_group_array(s.name) FROM api_fact_sources fs INNER JOIN api_source s ON s.id = fs.source_id
+                WHERE fs.fact_id = f.id) AS source_names
+        FROM api_fact f
+        LEFT OUTER JOIN api_tag c ON c.id = f.context_id
+        LEFT OUTER JOIN api_period p ON p.id = f.period_id
+        """,
+    ],
+    'postgresql': [
+        """
+        CREATE MATERIALIZED VIEW fact_feed AS
+        SELECT f.id, f.user_id, f.key, f.value, c.name AS context_name, p.start AS period_start, p."end" AS period_end,
+            COALESCE((SELECT json_agg(t.name) FROM api_fact_tags ft INNER JOIN api_tag t ON t.id = ft.tag_id
+                WHERE ft.fact_id = f.id), '[]')::text AS tag_names,
+            COALESCE((SELECT json_agg(s.name) FROM api_fact_sources fs INNER JOIN api_source s ON s.id = fs.source_id
+                WHERE fs.fact_id = f.id), '[]')::text AS source_names
+        FROM api_fact f
+        LEFT OUTER JOIN api_tag c ON c.id = f.context_id
+        LEFT OUTER JOIN api_period p ON p.id = f.period_id
+        """,
+        # A unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+        "CREATE UNIQUE INDEX fact_feed_user_id_id ON fact_feed (user_id, id)",
+    ],
+}
+
+DROP_VIEW = {
+    'sqlite': ["DROP VIEW IF EXISTS fact_feed"],
+    'postgresql': ["DROP MATERIALIZED VIEW IF EXISTS fact_feed"],
+}
+
+
+def _run_for_vendor(statements):
+    def run(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        if vendor not in statements:
+            raise NotSupportedError("Fact feed view requires SQLite or PostgreSQL, not {}".format(vendor))
+        for sql in statements[vendor]:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_owner_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FactFeed',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=128)),
+                ('value', models.CharField(max_length=128)),
+                ('context_name', models.CharField(max_length=64, null=True)),
+                ('period_start', models.DateTimeField(null=True)),
+                ('period_end', models.DateTimeField(null=True)),
+                ('tag_names', models.TextField()),
+                ('source_names', models.TextField()),
+            ],
+            options={
+                'db_table': 'fact_feed',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(_run_for_vendor(CREATE_VIEW), _run_for_vendor(DROP_VIEW)),
+    ]
@@ -0,0 +1,55 @@
+from django.db import NotSupportedError, migrations
+
+# Django 2.1 has no CheckConstraint, and SQLite can't add a CHECK to an existing table, so SQLite uses triggers
+CREATE_CONSTRAINT = {
+    'sqlite': [
+        """
+        CREATE TRIGGER api_period_start_before_end_insert BEFORE INSERT ON api_period
+        WHEN NEW.start > NEW."end"
+        BEGIN
+            SELECT RAISE(ABORT, 'period_start_before_end');
+        END
+        """,
+        """
+        CREATE TRIGGER api_period_start_before_end_update BEFORE UPDATE OF start, "end" ON api_period
+        WHEN NEW.start > NEW."end"
+        BEGIN
+            SELECT RAISE(ABORT, 'period_start_before_end');
+        END
+        """,
+    ],
+    'postgresql': [
+        'ALTER TABLE api_period ADD CONSTRAINT period_start_before_end CHECK (start <= "end")',
+    ],
+}
+
+DROP_CONSTRAINT = {
+    'sqlite': [
+        "DROP TRIGGER IF EXISTS api_period_start_before_end_insert",
+        "DROP TRIGGER IF EXISTS api_period_start_before_end_update",
+    ],
+    'postgresql': [
+        "ALTER TABLE api_period DROP CONSTRAINT IF EXISTS period_start_before_end",
+    ],
+}
+
+
+def _run_for_vendor(statements):
+    def run(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        if vendor not in statements:
+            raise NotSupportedError("Period constraint requires SQLite or PostgreSQL, not {}".format(vendor))
+        for sql in statements[vendor]:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_fact_feed'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run_for_vendor(CREATE_CONSTRAINT), _run_for_vendor(DROP_CONSTRAINT)),
+    ]
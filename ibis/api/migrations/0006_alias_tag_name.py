@@ -0,0 +1,26 @@
+# Generated by Django 2.1.15 on 2026-10-15 06:13
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_tag_names(apps, schema_editor):
+    Alias = apps.get_model('api', 'Alias')
+    Tag = apps.get_model('api', 'Tag')
+    Alias.objects.update(tag_name=Subquery(Tag.objects.filter(pk=OuterRef('tag_id')).values('name')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_period_start_before_end'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alias',
+            name='tag_name',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.RunPython(copy_tag_names, migrations.RunPython.noop),
+    ]
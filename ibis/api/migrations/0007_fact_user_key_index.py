@@ -0,0 +1,17 @@
+# Generated by Django 2.1.15 on 2026-10-15 06:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_alias_tag_name'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fact',
+            index=models.Index(fields=['user', 'key'], name='api_fact_user_id_cd7a90_idx'),
+        ),
+    ]
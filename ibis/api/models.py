@@ -1,6 +1,8 @@
 from django.contrib.auth.models import User
 from django.db.models import Manager, Model, DateTimeField, CharField, TextField, ForeignKey, ManyToManyField, \
-    SET_NULL, CASCADE
+    Index, SET_NULL, CASCADE, DO_NOTHING
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.urls import reverse
 from django.utils import timezone
 
@@ -38,15 +40,19 @@ class Source(APIModel):
     published = DateTimeField(null=True, blank=True)
     user = ForeignKey(User, on_delete=CASCADE, related_query_name='%(class)s')
 
+    class Meta(APIModel.Meta):
+        indexes = [Index(fields=['user', 'name'])]
+
     def __str__(self) -> str:
-        s = '"{0.name}"'
+        parts = [f'"{self.name}"']
         if self.author:
-            s += " by {0.author}"
+            parts.append(f" by {self.author}")
         if self.published:
-            s += " on {0.published:%Y-%m-%d}"
-        return s.format(self)
+            parts.append(f" on {self.published:%Y-%m-%d}")
+        return ''.join(parts)
 
 
+# WARNING: triggers on api_period (migration 0005) must be re-created when altering it on SQLite, see README
 class Period(APIModel):
     """
     A period of time
@@ -66,14 +72,17 @@ class Period(APIModel):
     end = DateTimeField(null=True, blank=True)
     user = ForeignKey(User, on_delete=CASCADE, related_query_name='%(class)s')
 
+    class Meta(APIModel.Meta):
+        indexes = [Index(fields=['user', 'start'])]
+
     def __str__(self) -> str:
         if self.start:
             if self.end:
-                return "{0.start:%Y-%m-%d %H:%M:%S} to {0.end:%Y-%m-%d %H:%M:%S}".format(self)
+                return f"{self.start:%Y-%m-%d %H:%M:%S} to {self.end:%Y-%m-%d %H:%M:%S}"
             else:
-                return "from {0.start:%Y-%m-%d %H:%M:%S}".format(self)
+                return f"from {self.start:%Y-%m-%d %H:%M:%S}"
         elif self.end:
-            return "until {0.end:%Y-%m-%d %H:%M:%S}".format(self)
+            return f"until {self.end:%Y-%m-%d %H:%M:%S}"
         else:
             return "(unknown period)"
 
@@ -89,6 +98,9 @@ class TagType(APIModel):
     user = ForeignKey(User, on_delete=CASCADE, related_query_name='%(class)s')
     # Once front-end editing is live, this will likely include a "template" field for rendering tags by type
 
+    class Meta(APIModel.Meta):
+        indexes = [Index(fields=['user', 'name'])]
+
     def __str__(self) -> str:
         return str(self.name)
 
@@ -117,6 +129,14 @@ class Tag(APIModel):
 
     class Meta(APIModel.Meta):
         unique_together = (('name', 'user'),)
+        indexes = [Index(fields=['user', 'name'])]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Name as stored in the database, so aliases are only updated on renames
+        instance._saved_name = instance.__dict__.get('name')
+        return instance
 
     def __str__(self) -> str:
         return str(self.name)
@@ -128,21 +148,52 @@ class Alias(APIModel):
 
     name (str): Alias (unique per user)
     tag (Tag): Tag referenced by the alias
+    tag_name (str): Copy of the tag's name, so aliases can be displayed without joining the tag
     user (User): Owner of this object
     """
     name = CharField(max_length=64)
     tag = ForeignKey(Tag, on_delete=CASCADE, related_query_name='%(class)s')
+    tag_name = CharField(max_length=64, blank=True)
     user = ForeignKey(User, on_delete=CASCADE, related_query_name='%(class)s')
 
     class Meta(APIModel.Meta):
         default_related_name = '%(class)ses'
         unique_together = (('name', 'user'),)
+        indexes = [Index(fields=['user', 'name'])]
         verbose_name_plural = "aliases"
 
     def __str__(self) -> str:
-        return "{0.name} -> {0.tag.name}".format(self)
+        # Prefer the tag itself when it's loaded, as the copied name is only updated on save
+        tag_name = self.tag.name if Alias.tag.is_cached(self) else self.tag_name
+        return f"{self.name} -> {tag_name}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Tag as stored in the database, so the name is only copied when the tag changes
+        instance._saved_tag_id = instance.__dict__.get('tag_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self._state.adding or self.tag_id != getattr(self, '_saved_tag_id', None):
+            if Alias.tag.is_cached(self):
+                self.tag_name = self.tag.name
+            else:
+                self.tag_name = Tag.objects.values_list('name', flat=True).get(pk=self.tag_id)
+        super().save(*args, **kwargs)
+        self._saved_tag_id = self.tag_id
+
+
+@receiver(post_save, sender=Tag)
+def _update_alias_tag_names(sender, instance: Tag, created: bool, update_fields, **kwargs):
+    # Keeps Alias.tag_name in sync when a tag is renamed
+    renamed = instance.name != getattr(instance, '_saved_name', None)
+    if not created and renamed and (update_fields is None or 'name' in update_fields):
+        Alias.objects.filter(tag=instance).update(tag_name=instance.name)
+    instance._saved_name = instance.name
 
 
+# WARNING: triggers on api_fact (migration 0002) must be re-created when altering it on SQLite, see README
 class Fact(APIModel):
     """
     Individual, verifiable, sourced information
@@ -152,6 +203,7 @@ class Fact(APIModel):
     value (str): The information/claim itself (or string representation of value for key-value facts)
     context (Tag): Optional context prefix for the fact (e.g. context: Rome, key: population, value: 200 leads to the
         fact "Rome - population: 200"). Context is always also included in the "tags" set
+        (kept in sync by a database trigger, see migration 0002)
     period (Period): Period of time in which the claim takes place
     user (User): Owner of this object
 
@@ -167,17 +219,44 @@ class Fact(APIModel):
     sources = ManyToManyField(Source, blank=True, related_query_name='%(class)s')
     user = ForeignKey(User, on_delete=CASCADE, related_query_name='%(class)s')
 
+    class Meta(APIModel.Meta):
+        indexes = [Index(fields=['user', 'context']), Index(fields=['user', 'key'])]
+
     def __str__(self) -> str:
-        s = ""
+        parts = []
         if self.context:
-            s += "{0.context} - "
+            parts.append(f"{self.context} - ")
         if self.key:
-            s += "{0.key}: "
-        s += "{0.value}"
-        return s.format(self)
+            parts.append(f"{self.key}: ")
+        parts.append(self.value)
+        return ''.join(parts)
 
-    def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # Ensure context is added to tags. Does nothing if relationship already exists
-        if self.context:
-            self.tags.add(self.context)
+
+class FactFeed(Model):
+    """
+    Read-only roll-up of a fact with the names of everything it references, for rendering feeds in a single query
+
+    Backed by the fact_feed database view (materialized on PostgreSQL, refresh with the refresh_fact_feed command).
+
+    Object properties:
+    key (str): Fact key
+    value (str): Fact value
+    context_name (str): Name of the fact's context tag
+    period_start (datetime): Start of the fact's period
+    period_end (datetime): End of the fact's period
+    tag_names (str): JSON list of the names of the fact's tags
+    source_names (str): JSON list of the names of the fact's sources
+    user (User): Owner of the fact
+    """
+    key = CharField(max_length=128)
+    value = CharField(max_length=128)
+    context_name = CharField(max_length=64, null=True)
+    period_start = DateTimeField(null=True)
+    period_end = DateTimeField(null=True)
+    tag_names = TextField()
+    source_names = TextField()
+    user = ForeignKey(User, on_delete=DO_NOTHING, related_name='+')
+
+    class Meta:
+        managed = False
+        db_table = 'fact_feed'
@@ -1,9 +1,103 @@
-from rest_framework.serializers import ModelSerializer, PrimaryKeyRelatedField, ValidationError
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Manager, Prefetch, prefetch_related_objects
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.relations import ManyRelatedField, RelatedField, MANY_RELATION_KWARGS
+from rest_framework.serializers import ListSerializer, ModelSerializer, PrimaryKeyRelatedField, \
+    SerializerMethodField, ValidationError
+
+from api.models import Source, Fact, FactFeed, Alias, Tag, TagType, Period
+
+
+class EagerLoadingMixin:
+    """
+    Declares the relations a serializer walks so viewsets can fetch them up front instead of once per row
+
+    select_related_fields: Foreign keys to join into the main query
+    prefetch_related_fields: Many-to-many/reverse relations to fetch in one extra query each. Relations that are only
+        rendered as primary keys should use a Prefetch limited to the pk, so the related rows aren't loaded in full
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        # select_related() with no arguments follows every non-null FK, so only call it when fields are declared
+        if cls.select_related_fields:
+            queryset = queryset.select_related(*cls.select_related_fields)
+        if cls.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*cls.prefetch_related_fields)
+        return queryset
+
+
+class EagerLoadingListSerializer(ListSerializer):
+    """
+    Prefetches the child serializer's relations for whatever it's given, so lists don't depend on the caller having
+    used setup_eager_loading
+    """
+    @staticmethod
+    def _is_prefetched(obj, lookup) -> bool:
+        # prefetch_related_objects() looks for the lookup's own name, but reverse many-to-many relations are cached
+        # under their related query name (e.g. Source.facts under 'fact') and would be fetched a second time
+        if isinstance(lookup, Prefetch):
+            if lookup.to_attr:
+                return hasattr(obj, lookup.to_attr)
+            lookup = lookup.prefetch_through
+        attr = lookup.split(LOOKUP_SEP)[0]
+        cache_name = getattr(getattr(obj, attr), 'prefetch_cache_name', attr)
+        return cache_name in getattr(obj, '_prefetched_objects_cache', {})
+
+    def to_representation(self, data):
+        if isinstance(data, Manager):
+            data = data.all()
+        if self.child.prefetch_related_fields:
+            data = list(data)
+            # Lookups the objects already went through (e.g. a page of an eager loaded queryset) are skipped
+            lookups = [lookup for lookup in self.child.prefetch_related_fields
+                       if not all(self._is_prefetched(obj, lookup) for obj in data)]
+            if data and lookups:
+                prefetch_related_objects(data, *lookups)
+        return super().to_representation(data)
+
+
+class BulkManyRelatedField(ManyRelatedField):
+    """
+    List of primary key relations that looks up all referenced objects in a single query instead of one per item
+    """
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        queryset = self.child_relation.get_queryset()
+        pks = []
+        for item in data:
+            try:
+                pks.append(queryset.model._meta.pk.to_python(item))
+            except DjangoValidationError:
+                self.child_relation.fail('incorrect_type', data_type=type(item).__name__)
+        objects = queryset.in_bulk(pks)
+        for pk in pks:
+            if pk not in objects:
+                self.child_relation.fail('does_not_exist', pk_value=pk)
+        return [objects[pk] for pk in pks]
+
+
+class BulkPrimaryKeyRelatedField(PrimaryKeyRelatedField):
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+
+class OwnedModelSerializer(EagerLoadingMixin, ModelSerializer):
+    serializer_related_field = BulkPrimaryKeyRelatedField
 
-from api.models import Source, Fact, Alias, Tag, TagType, Period
-
-
-class OwnedModelSerializer(ModelSerializer):
     @property
     def user(self):
         return self.context['request'].user
@@ -13,25 +107,32 @@ class OwnedModelSerializer(ModelSerializer):
         self.validated_data['user'] = self.user
         return super().save()
 
-    def _validate_owned(self, value):
-        if value.user != self.user:
-            raise ValidationError("Accessing another user's objects is forbidden")
-        return value
-
-    def _validate_owned_list(self, values):
-        return [self._validate_owned(val) for val in values]
+    def get_fields(self):
+        fields = super().get_fields()
+        if 'request' not in self.context:
+            # Read-only use without a request, there is no user to restrict references to
+            return fields
+        # Restrict references to the requesting user's objects, so ownership is checked by the lookup query itself
+        for field in fields.values():
+            relation = field.child_relation if isinstance(field, ManyRelatedField) else field
+            if not isinstance(relation, RelatedField) or relation.queryset is None:
+                continue
+            if any(f.name == 'user' for f in relation.queryset.model._meta.get_fields()):
+                relation.queryset = relation.queryset.filter(user=self.user)
+                relation.error_messages['does_not_exist'] = \
+                    'Invalid pk "{pk_value}" - object does not exist or accessing it is forbidden.'
+        return fields
 
 
 class SourceSerializer(OwnedModelSerializer):
-    facts = PrimaryKeyRelatedField(many=True, queryset=Fact.objects.all(), required=False)
+    facts = BulkPrimaryKeyRelatedField(many=True, queryset=Fact.objects.all(), required=False)
+    prefetch_related_fields = (Prefetch('facts', queryset=Fact.objects.only('id')),)
 
     class Meta:
         model = Source
+        list_serializer_class = EagerLoadingListSerializer
         fields = ('id', 'name', 'accessed', 'author', 'publisher', 'published', 'facts')
 
-    def validate_facts(self, value):
-        return self._validate_owned_list(value)
-
 
 class PeriodSerializer(OwnedModelSerializer):
     class Meta:
@@ -39,7 +140,10 @@ class PeriodSerializer(OwnedModelSerializer):
         fields = ('id', 'start', 'end')
 
     def validate(self, data):
-        if data['start'] > data['end']:
+        # Also enforced by the database, checked here to report it as a validation error
+        start = data.get('start', getattr(self.instance, 'start', None))
+        end = data.get('end', getattr(self.instance, 'end', None))
+        if start and end and start > end:
             raise ValidationError('Start must come before end')
         return data
 
@@ -51,39 +155,49 @@ class TagTypeSerializer(OwnedModelSerializer):
 
 
 class TagSerializer(OwnedModelSerializer):
+    prefetch_related_fields = (Prefetch('tags', queryset=Tag.objects.only('id')),)
+
     class Meta:
         model = Tag
+        list_serializer_class = EagerLoadingListSerializer
         fields = ('id', 'name', 'text', 'type', 'tags')
 
-    def validate_type(self, value):
-        return self._validate_owned(value)
 
-    def validate_tags(self, value):
-        return self._validate_owned_list(value)
+class TagListSerializer(TagSerializer):
+    # The long description is only sent when retrieving a single tag
+    class Meta(TagSerializer.Meta):
+        fields = ('id', 'name', 'type', 'tags')
 
 
 class AliasSerializer(OwnedModelSerializer):
     class Meta:
         model = Alias
-        fields = ('id', 'name', 'tag')
-
-    def validate_tag(self, value):
-        return self._validate_owned(value)
+        fields = ('id', 'name', 'tag', 'tag_name')
+        read_only_fields = ('tag_name',)
 
 
 class FactSerializer(OwnedModelSerializer):
+    prefetch_related_fields = (
+        Prefetch('tags', queryset=Tag.objects.only('id')),
+        Prefetch('sources', queryset=Source.objects.only('id')),
+    )
+
     class Meta:
         model = Fact
+        list_serializer_class = EagerLoadingListSerializer
         fields = ('id', 'key', 'value', 'context', 'period', 'tags', 'sources')
 
-    def validate_period(self, value):
-        return self._validate_owned(value)
 
-    def validate_context(self, value):
-        return self._validate_owned(value)
+class FactFeedSerializer(EagerLoadingMixin, ModelSerializer):
+    tag_names = SerializerMethodField()
+    source_names = SerializerMethodField()
+
+    class Meta:
+        model = FactFeed
+        fields = ('id', 'key', 'value', 'context_name', 'period_start', 'period_end', 'tag_names', 'source_names')
 
-    def validate_tags(self, value):
-        return self._validate_owned_list(value)
+    def get_tag_names(self, obj):
+        return json.loads(obj.tag_names)
 
-    def validate_sources(self, value):
-        return self._validate_owned_list(value)
+    def get_source_names(self, obj):
+        return json.loads(obj.source_names)
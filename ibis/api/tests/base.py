@@ -0,0 +1,17 @@
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework.test import APITestCase, APIRequestFactory
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class UserTestCase(APITestCase):
+    """
+    Test case with a user owning the objects under test. Passwords are hashed with MD5, as the default hasher would
+    make creating the fixtures by far the slowest part of the suite
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="u", password="p")
+        # Serializers only read the user off the request, so one request can be shared by every test
+        cls.request = APIRequestFactory().get('/')
+        cls.request.user = cls.user
@@ -1,33 +1,29 @@
 import json
 from datetime import datetime, timedelta
+from io import StringIO
 
-from django.contrib.auth.models import User
-from django.test import TransactionTestCase
-from rest_framework.test import APIClient
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
-from api.models import Source, Period, TagType, Tag, Alias, Fact
+from api.models import Source, Period, TagType, Tag, Alias, Fact, FactFeed
+from api.tests.base import UserTestCase
 
 
-class ModelTestCase(TransactionTestCase):
-    def setUp(self):
-        super().setUp()
-        self.user = User.objects.create_user(username="u", password="p")
-
-
-class APIModelTestCase(ModelTestCase):
+class APIModelTestCase(UserTestCase):
     def test_get_url(self):
         name = 'test_name'
         t = TagType(name=name, user=self.user)
         t.save()
-        client = APIClient()
-        client.force_authenticate(user=self.user)
-        response = client.get(t.get_absolute_url())
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(t.get_absolute_url())
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data['id'], t.id)
         self.assertEqual(response.data['name'], name)
 
 
-class SourceTestCase(ModelTestCase):
+class SourceTestCase(UserTestCase):
     def test_str(self):
         name = "test_name"
         author = "test_author"
@@ -46,7 +42,7 @@ class SourceTestCase(ModelTestCase):
         self.assertIn(published.strftime("%Y-%m-%d"), str(source))
 
 
-class PeriodTestCase(ModelTestCase):
+class PeriodTestCase(UserTestCase):
     def test_str(self):
         start = datetime.now()
         end = datetime.now() - timedelta(days=1000, hours=1, minutes=1, seconds=1)  # ensuring we get different values
@@ -60,22 +56,29 @@ class PeriodTestCase(ModelTestCase):
         source.start = None
         self.assertIn(end.strftime("%Y-%m-%d %H:%M:%S"), str(source))
 
+    def test_start_before_end(self):
+        start = timezone.now()
+        Period.objects.create(start=start, end=start, user=self.user)
+        Period.objects.create(end=start, user=self.user)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Period.objects.create(start=start, end=start - timedelta(days=1), user=self.user)
 
-class TagTypeTestCase(ModelTestCase):
+
+class TagTypeTestCase(UserTestCase):
     def test_str(self):
         name = "test_name"
         tag_type = TagType(name=name, user=self.user)
         self.assertIn(name, str(tag_type))
 
 
-class TagTestCase(ModelTestCase):
+class TagTestCase(UserTestCase):
     def test_str(self):
         name = "test_name"
         tag = Tag(name=name, user=self.user)
         self.assertIn(name, str(tag))
 
 
-class AliasTestCase(ModelTestCase):
+class AliasTestCase(UserTestCase):
     def test_str(self):
         alias = "test_alias"
         name = "test_name"
@@ -83,8 +86,47 @@ class AliasTestCase(ModelTestCase):
         self.assertIn(alias, str(tag_alias))
         self.assertIn(name, str(tag_alias))
 
-
-class FactTestCase(ModelTestCase):
+    def test_tag_name(self):
+        tag = Tag.objects.create(name='test_name', user=self.user)
+        Alias.objects.create(name='test_alias', tag=tag, user=self.user)
+        tag_alias = Alias.objects.get(name='test_alias')
+        with self.assertNumQueries(0):
+            self.assertIn(tag.name, str(tag_alias))
+        tag.name = 'new_name'
+        tag.save()
+        self.assertEqual(Alias.objects.get(name='test_alias').tag_name, tag.name)
+
+    def test_tag_name_unchanged(self):
+        tag = Tag.objects.create(name='test_name', user=self.user)
+        Alias.objects.create(name='test_alias', tag=tag, user=self.user)
+        tag_alias = Alias.objects.get(name='test_alias')
+        tag_alias.name = 'new_alias'
+        # Only the UPDATE itself, the tag isn't fetched again
+        with self.assertNumQueries(1):
+            tag_alias.save()
+        tag = Tag.objects.get(pk=tag.pk)
+        tag.text = 'new_text'
+        with CaptureQueriesContext(connection) as queries:
+            tag.save()
+        self.assertFalse(any('api_alias' in query['sql'] for query in queries))
+
+
+class DatabaseTriggerTestCase(UserTestCase):
+    def test_triggers_exist(self):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+                expected = {'api_fact_context_tag_insert', 'api_fact_context_tag_update',
+                            'api_period_start_before_end_insert', 'api_period_start_before_end_update'}
+            else:
+                # PostgreSQL has a real CHECK constraint on api_period, so only Fact relies on a trigger
+                self.assertIn('period_start_before_end', connection.introspection.get_constraints(cursor, 'api_period'))
+                cursor.execute("SELECT trigger_name FROM information_schema.triggers")
+                expected = {'api_fact_context_tag_insert', 'api_fact_context_tag_update'}
+            self.assertLessEqual(expected, {row[0] for row in cursor.fetchall()})
+
+
+class FactTestCase(UserTestCase):
     def test_str(self):
         key = "test_key"
         value = "test_value"
@@ -107,9 +149,51 @@ class FactTestCase(ModelTestCase):
         context.save()
         fact = Fact(value='test_value', user=self.user)
         fact.save()
-        self.assertNotIn(context, list(fact.tags.all()))
+        self.assertFalse(fact.tags.filter(pk=context.pk).exists())
         self.assertIsNone(fact.context)
         fact.context = context
         fact.save()
-        self.assertIn(context, list(fact.tags.all()))
+        self.assertTrue(fact.tags.filter(pk=context.pk).exists())
         self.assertEqual(fact.context, context)
+
+    def test_unchanged_context_save(self):
+        context = Tag(name='test_context', user=self.user)
+        context.save()
+        fact = Fact(value='test_value', context=context, user=self.user)
+        fact.save()
+        fact.tags.remove(context)
+        fact = Fact.objects.get(pk=fact.pk)
+        fact.value = 'new_value'
+        fact.save()
+        # Context is only written to tags when it changes, so saving doesn't bring the removed row back
+        self.assertFalse(fact.tags.filter(pk=context.pk).exists())
+
+    def test_context_in_tags_update(self):
+        context = Tag(name='test_context', user=self.user)
+        context.save()
+        fact = Fact(value='test_value', user=self.user)
+        fact.save()
+        # Bypasses Model.save(), so this relies on the database keeping context in tags
+        Fact.objects.filter(pk=fact.pk).update(context=context)
+        self.assertTrue(fact.tags.filter(pk=context.pk).exists())
+
+    def test_context_in_tags_bulk_create(self):
+        contexts = [Tag.objects.create(name=f'test_context_{i}', user=self.user) for i in range(3)]
+        Fact.objects.bulk_create(Fact(value='test_value', context=context, user=self.user) for context in contexts)
+        # Context tags are written with the facts themselves, there's no need for a second bulk insert
+        for fact in Fact.objects.filter(user=self.user):
+            self.assertEqual(list(fact.tags.all()), [fact.context])
+
+
+class FactFeedTestCase(UserTestCase):
+    def test_feed(self):
+        context = Tag.objects.create(name='test_context', user=self.user)
+        source = Source.objects.create(name='test_source', user=self.user)
+        fact = Fact.objects.create(value='test_value', context=context, user=self.user)
+        fact.sources.add(source)
+        call_command('refresh_fact_feed', stdout=StringIO())
+        feed = FactFeed.objects.get(pk=fact.pk)
+        self.assertEqual(feed.user_id, self.user.id)
+        self.assertEqual(feed.context_name, context.name)
+        self.assertEqual(json.loads(feed.tag_names), [context.name])
+        self.assertEqual(json.loads(feed.source_names), [source.name])
@@ -0,0 +1,89 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api.models import Source, Period, TagType, Tag, Alias, Fact
+from api.serializers import SourceSerializer, PeriodSerializer, TagTypeSerializer, TagListSerializer, \
+    AliasSerializer, FactSerializer
+from api.tests.base import UserTestCase
+
+
+class ListQueryCountTestCase(UserTestCase):
+    """
+    List endpoints should take one query for the objects plus one per prefetched relation, regardless of row count
+    """
+    count = 10
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        tag_types = [TagType.objects.create(name=f'type_{i}', user=cls.user) for i in range(cls.count)]
+        tags = [Tag.objects.create(name=f'tag_{i}', type=tag_types[i], user=cls.user) for i in range(cls.count)]
+        sources = [Source.objects.create(name=f'source_{i}', user=cls.user) for i in range(cls.count)]
+        periods = [Period.objects.create(user=cls.user) for _ in range(cls.count)]
+        for i in range(cls.count):
+            tags[i].tags.set(tags[:i])
+            Alias.objects.create(name=f'alias_{i}', tag=tags[i], user=cls.user)
+            fact = Fact.objects.create(value=f'fact_{i}', context=tags[i], period=periods[i], user=cls.user)
+            fact.tags.add(*tags[:i])
+            fact.sources.set(sources[:i + 1])
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(user=self.user)
+
+    def _test_list(self, basename: str, serializer: type):
+        """
+        Tests the number of queries needed to list every object of a type
+        :param basename: Router basename of the viewset
+        :param serializer: Serializer class used to render the list
+        """
+        with self.assertNumQueries(1 + len(serializer.prefetch_related_fields)):
+            response = self.client.get(reverse(f'{basename}-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), self.count)
+
+    def test_sources(self):
+        self._test_list('source', SourceSerializer)
+
+    def test_periods(self):
+        self._test_list('period', PeriodSerializer)
+
+    def test_tag_types(self):
+        self._test_list('tagtype', TagTypeSerializer)
+
+    def test_tags(self):
+        self._test_list('tag', TagListSerializer)
+
+    def test_aliases(self):
+        self._test_list('alias', AliasSerializer)
+
+    def test_facts(self):
+        self._test_list('fact', FactSerializer)
+
+    def test_tags_without_text(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('tag-list'))
+        # The long description is only part of the detail view
+        self.assertNotIn('"api_tag"."text"', queries[0]['sql'])
+
+    def test_serializer_prefetch(self):
+        facts = list(Fact.objects.filter(user=self.user))
+        # Serializers prefetch for plain lists too, not only for querysets prepared by the viewsets
+        with self.assertNumQueries(len(FactSerializer.prefetch_related_fields)):
+            data = FactSerializer(facts, many=True, context={'request': self.request}).data
+        self.assertEqual(len(data), self.count)
+
+    def test_serializer_prefetched_list(self):
+        queryset = SourceSerializer.setup_eager_loading(Source.objects.filter(user=self.user))
+        # Lists of already prefetched objects (e.g. a paginated page) aren't prefetched a second time
+        with self.assertNumQueries(1 + len(SourceSerializer.prefetch_related_fields)):
+            data = SourceSerializer(list(queryset), many=True, context={'request': self.request}).data
+        self.assertEqual(len(data), self.count)
+
+    def test_serializer_partially_prefetched_list(self):
+        queryset = Fact.objects.filter(user=self.user).prefetch_related('tags')
+        # Relations the caller didn't prefetch are still fetched in one query instead of once per row
+        with self.assertNumQueries(1 + len(FactSerializer.prefetch_related_fields)):
+            data = FactSerializer(list(queryset), many=True, context={'request': self.request}).data
+        self.assertEqual(len(data), self.count)
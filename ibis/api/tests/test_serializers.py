@@ -2,67 +2,67 @@ from datetime import timedelta
 
 from django.contrib.auth.models import User
 from django.db.models import Model
-from django.http import HttpRequest
 from django.utils import timezone
-from rest_framework.test import APITestCase
 
 from api.models import Tag, TagType, Source, Fact, Alias
 from api.serializers import TagSerializer, SourceSerializer, AliasSerializer, PeriodSerializer
+from api.tests.base import UserTestCase
 
 
-class SerializerTestCase(APITestCase):
-    def setUp(self):
-        super().setUp()
-        self.username = "test_user"
-        self.password = "test_pass"
-        self.user = User.objects.create_user(username=self.username, password=self.password)
-        self.user2 = User.objects.create_user(username='u2', password='p2')
+class SerializerTestCase(UserTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user2 = User.objects.create_user(username='u2', password='p2')
 
-    def _test_cross_user(self, cls: type, obj: Model, ref: Model, key: str, is_list: bool):
+    def _reference_serializer(self, cls: type, obj: Model, ref: Model, key: str, is_list: bool):
         """
-        Tests that adding a reference to another user's object should fail
+        Saves both objects and builds a serializer for a partial update adding the reference to obj
         :param cls: Serializer class
         :param obj: Object to be serialized
-        :param ref: Reference to add, with a different user than obj
+        :param ref: Reference to add
         :param key: Attribute field name for the reference
         :param is_list: Whether to treat it as a single reference or single-item list of references
         """
         obj.save()
         ref.save()
-        request = HttpRequest()
-        request.user = self.user
         if is_list:
             data = {key: [ref.pk]}
         else:
             data = {key: ref.pk}
-        serializer = cls(obj, data=data, partial=True, context={'request': request})
+        return cls(obj, data=data, partial=True, context={'request': self.request})
+
+    def _test_cross_user(self, cls: type, obj: Model, ref: Model, key: str, is_list: bool):
+        """
+        Tests that adding a reference to another user's object should fail
+        :param cls: Serializer class
+        :param obj: Object to be serialized
+        :param ref: Reference to add, with a different user than obj
+        :param key: Attribute field name for the reference
+        :param is_list: Whether to treat it as a single reference or single-item list of references
+        """
+        serializer = self._reference_serializer(cls, obj, ref, key, is_list)
         self.assertFalse(serializer.is_valid())
         self.assertEqual(serializer.errors.keys(), {key})
         self.assertEqual(len(serializer.errors[key]), 1)
         self.assertIn("forbidden", serializer.errors[key][0])
 
-    def _test_same_user(self, cls: type, obj: Model, ref: Model, key: str, is_list: bool):
+    def _test_same_user(self, cls: type, obj: Model, ref: Model, key: str, is_list: bool, save_queries: int):
         """
-        Tests that adding a reference to another user's object should fail
+        Tests that adding a reference to the same user's object should succeed
         :param cls: Serializer class
         :param obj: Object to be serialized
         :param ref: Reference to add, with the same user as obj
         :param key: Attribute field name for the reference
         :param is_list: Whether to treat it as a single reference or single-item list of references
+        :param save_queries: Number of queries expected to save the reference
         """
-        obj.save()
-        ref.save()
-        request = HttpRequest()
-        request.user = self.user
-        if is_list:
-            data = {key: [ref.pk]}
-        else:
-            data = {key: ref.pk}
-        serializer = cls(obj, data=data, partial=True, context={'request': request})
+        serializer = self._reference_serializer(cls, obj, ref, key, is_list)
         self.assertTrue(serializer.is_valid())
-        obj = serializer.save()
+        with self.assertNumQueries(save_queries):
+            obj = serializer.save()
         if is_list:
-            self.assertEqual(getattr(obj, key).get(pk=ref.pk), ref)
+            self.assertTrue(getattr(obj, key).filter(pk=ref.pk).exists())
         else:
             self.assertEqual(getattr(obj, key), ref)
 
@@ -81,14 +81,28 @@ class SourceTestCase(SerializerTestCase):
             SourceSerializer,
             Source(name='s', user=self.user),
             Fact(value='f', user=self.user),
-            'facts', is_list=True
+            'facts', is_list=True, save_queries=4
         )
 
+    def test_facts_single_query(self):
+        source = Source.objects.create(name='s', user=self.user)
+        facts = [Fact.objects.create(value=f'f{i}', user=self.user) for i in range(3)]
+        serializer = SourceSerializer(source, data={'facts': [fact.pk for fact in facts]}, partial=True,
+                                      context={'request': self.request})
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.validated_data['facts'], facts)
+
+    def test_without_request(self):
+        source = Source.objects.create(name='s1', user=self.user)
+        fact = Fact.objects.create(value='f1', user=self.user)
+        fact.sources.add(source)
+        data = SourceSerializer(Source.objects.filter(user=self.user), many=True).data
+        self.assertEqual(data[0]['facts'], [fact.pk])
+
     def test_create(self):
         name = 's'
-        request = HttpRequest()
-        request.user = self.user
-        serializer = SourceSerializer(data={'name': name}, context={'request': request})
+        serializer = SourceSerializer(data={'name': name}, context={'request': self.request})
         self.assertTrue(serializer.is_valid())
         source = serializer.save()
         # Ensure the database matches what we saved
@@ -100,15 +114,17 @@ class PeriodTestCase(SerializerTestCase):
     def test_period_order(self):
         start = timezone.now()
         end = start - timedelta(days=1)
-        request = HttpRequest()
-        request.user = self.user
-        serializer = PeriodSerializer(data={'start': start, 'end': end}, context={'request': request})
+        serializer = PeriodSerializer(data={'start': start, 'end': end}, context={'request': self.request})
         self.assertFalse(serializer.is_valid())
         self.assertEqual(serializer.errors.keys(), {'non_field_errors'})
         self.assertEqual(len(serializer.errors['non_field_errors']), 1)
         self.assertIn("start", serializer.errors['non_field_errors'][0].lower())
         self.assertIn("end", serializer.errors['non_field_errors'][0].lower())
 
+    def test_period_partial(self):
+        serializer = PeriodSerializer(data={'start': timezone.now()}, context={'request': self.request})
+        self.assertTrue(serializer.is_valid())
+
 
 class TagTestCase(SerializerTestCase):
     def test_cross_user_tag(self):
@@ -124,7 +140,7 @@ class TagTestCase(SerializerTestCase):
             TagSerializer,
             Tag(name='t1', user=self.user),
             Tag(name='t2', user=self.user),
-            'tags', is_list=True
+            'tags', is_list=True, save_queries=4
         )
 
     def test_cross_user_type(self):
@@ -140,7 +156,7 @@ class TagTestCase(SerializerTestCase):
             TagSerializer,
             Tag(name='t1', user=self.user),
             TagType(name='type', user=self.user),
-            'type', is_list=False
+            'type', is_list=False, save_queries=1
         )
 
 
@@ -148,9 +164,7 @@ class AliasTestCase(SerializerTestCase):
     def test_cross_user_tag(self):
         tag = Tag(name='t2', user=self.user2)
         tag.save()
-        request = HttpRequest()
-        request.user = self.user
-        serializer = AliasSerializer(data={'name': 't1', 'tag': tag.pk}, context={'request': request})
+        serializer = AliasSerializer(data={'name': 't1', 'tag': tag.pk}, context={'request': self.request})
         self.assertFalse(serializer.is_valid())
         self.assertEqual(serializer.errors.keys(), {'tag'})
         self.assertEqual(len(serializer.errors['tag']), 1)
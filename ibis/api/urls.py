@@ -2,7 +2,8 @@ from django.conf.urls import url
 from django.urls import include
 from rest_framework.routers import DefaultRouter
 
-from api.views import SourceViewSet, PeriodViewSet, TagTypeViewSet, TagViewSet, AliasViewSet, FactViewSet
+from api.views import SourceViewSet, PeriodViewSet, TagTypeViewSet, TagViewSet, AliasViewSet, FactViewSet, \
+    FactFeedViewSet
 
 router = DefaultRouter()
 router.register(r'sources', SourceViewSet)
@@ -11,6 +12,7 @@ router.register(r'tag_types', TagTypeViewSet)
 router.register(r'tags', TagViewSet)
 router.register(r'aliases', AliasViewSet)
 router.register(r'facts', FactViewSet)
+router.register(r'fact_feed', FactFeedViewSet)
 
 
 urlpatterns = [
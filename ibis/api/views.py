@@ -1,13 +1,24 @@
-from rest_framework.viewsets import ModelViewSet
+from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 
-from api.models import Source, Period, TagType, Tag, Alias, Fact
-from api.serializers import SourceSerializer, PeriodSerializer, TagTypeSerializer, TagSerializer, AliasSerializer, \
-    FactSerializer
+from api.models import Source, Period, TagType, Tag, Alias, Fact, FactFeed
+from api.serializers import SourceSerializer, PeriodSerializer, TagTypeSerializer, TagSerializer, TagListSerializer, \
+    AliasSerializer, FactSerializer, FactFeedSerializer
 
 
-class UserModelViewSet(ModelViewSet):
+class UserQuerySetMixin:
     def get_queryset(self):
-        return super().get_queryset().filter(user=self.request.user.id)
+        queryset = super().get_queryset().filter(user_id=self.request.user.pk)
+        serializer_class = self.get_serializer_class()
+        # Only load the columns the serializer renders (FKs by name load their *_id column)
+        fields = getattr(serializer_class.Meta, 'fields', None)
+        if isinstance(fields, (list, tuple)):
+            columns = {field.name for field in queryset.model._meta.concrete_fields}
+            queryset = queryset.only(*(name for name in fields if name in columns))
+        return serializer_class.setup_eager_loading(queryset)
+
+
+class UserModelViewSet(UserQuerySetMixin, ModelViewSet):
+    pass
 
 
 class SourceViewSet(UserModelViewSet):
@@ -29,6 +40,11 @@ class TagViewSet(UserModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
 
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return TagListSerializer
+        return super().get_serializer_class()
+
 
 class AliasViewSet(UserModelViewSet):
     queryset = Alias.objects.all()
@@ -38,3 +54,8 @@ class AliasViewSet(UserModelViewSet):
 class FactViewSet(UserModelViewSet):
     queryset = Fact.objects.all()
     serializer_class = FactSerializer
+
+
+class FactFeedViewSet(UserQuerySetMixin, ReadOnlyModelViewSet):
+    queryset = FactFeed.objects.all()
+    serializer_class = FactFeedSerializer